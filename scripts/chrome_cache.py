@@ -4,16 +4,24 @@
 
 from __future__ import print_function
 import argparse
+import array
 import datetime
+import itertools
 import logging
+import mmap
 import os
+import re
+import struct
 import sys
 
-import construct
-
 import hexdump
 
 
+# The Chrome Cache date and time values are stored in number of micro seconds
+# since January 1, 1601, 00:00:00 UTC.
+_EPOCH = datetime.datetime(1601, 1, 1)
+
+
 def SuperFastHash(key):
   """Function to calculate the super fast hash.
 
@@ -29,39 +37,37 @@ def SuperFastHash(key):
   key_length = len(key)
   hash_value = key_length & 0xffffffff
   remainder = key_length & 0x00000003
-  key_length -= remainder
+  number_of_blocks = key_length // 4
 
-  for key_index in xrange(0, key_length, 4):
-    hash_value = (
-        (hash_value + ord(key[key_index]) + (ord(key[key_index + 1]) << 8)) &
-        0xffffffff)
+  # Decode the 4-byte blocks and the remainder of the key into little-endian
+  # 16-bit values and a trailing 8-bit value, if any, in a single call instead
+  # of combining the individual bytes in every iteration.
+  values = struct.unpack_from('<{0:d}H{1:s}'.format(
+      key_length // 2, u'B' if remainder & 1 else u''), key)
 
-    temp_value = ord(key[key_index + 2]) + (ord(key[key_index + 3]) << 8)
+  number_of_block_values = number_of_blocks * 2
+  for lower_value, upper_value in zip(
+      values[0:number_of_block_values:2], values[1:number_of_block_values:2]):
+    hash_value = (hash_value + lower_value) & 0xffffffff
 
-    temp_value = ((temp_value << 11) & 0xffffffff) ^ hash_value
+    temp_value = ((upper_value << 11) & 0xffffffff) ^ hash_value
     hash_value = ((hash_value << 16) & 0xffffffff) ^ temp_value
 
     hash_value = (hash_value + (hash_value >> 11)) & 0xffffffff
 
-  key_index = key_length
-
   if remainder == 3:
-    hash_value = (
-        (hash_value + ord(key[key_index]) + (ord(key[key_index + 1]) << 8)) &
-        0xffffffff)
+    hash_value = (hash_value + values[-2]) & 0xffffffff
     hash_value ^= (hash_value << 16) & 0xffffffff
-    hash_value ^= (ord(key[key_index + 2]) << 18) & 0xffffffff
+    hash_value ^= (values[-1] << 18) & 0xffffffff
     hash_value = (hash_value + (hash_value >> 11)) & 0xffffffff
 
   elif remainder == 2:
-    hash_value = (
-        (hash_value + ord(key[key_index]) + (ord(key[key_index + 1]) << 8)) &
-        0xffffffff)
+    hash_value = (hash_value + values[-1]) & 0xffffffff
     hash_value ^= (hash_value << 11) & 0xffffffff
     hash_value = (hash_value + (hash_value >> 17)) & 0xffffffff
 
   elif remainder == 1:
-    hash_value = (hash_value + ord(key[key_index])) & 0xffffffff
+    hash_value = (hash_value + values[-1]) & 0xffffffff
     hash_value ^= (hash_value << 10) & 0xffffffff
     hash_value = (hash_value + (hash_value >> 1)) & 0xffffffff
 
@@ -79,11 +85,16 @@ def SuperFastHash(key):
 class CacheAddress(object):
   """Class that contains a cache address.
 
+  The block data file values are only decoded when first accessed.
+
   Attributes:
     block_number (int): block data file number.
     block_offset (int): offset within the block data file.
     block_size (int): block size.
+    file_type (int): file type.
     filename (str): name of the block data file.
+    is_initialized (str): "True" if the cache address is initialized,
+        "False" otherwise.
     value (int): cache address.
   """
   FILE_TYPE_SEPARATE = 0
@@ -92,12 +103,6 @@ class CacheAddress(object):
   FILE_TYPE_BLOCK_1024 = 3
   FILE_TYPE_BLOCK_4096 = 4
 
-  _BLOCK_DATA_FILE_TYPES = [
-      FILE_TYPE_BLOCK_RANKINGS,
-      FILE_TYPE_BLOCK_256,
-      FILE_TYPE_BLOCK_1024,
-      FILE_TYPE_BLOCK_4096]
-
   _FILE_TYPE_DESCRIPTIONS = [
       u'Separate file',
       u'Rankings block file',
@@ -114,32 +119,86 @@ class CacheAddress(object):
       cache_address (int): cache address.
     """
     super(CacheAddress, self).__init__()
-    self.block_number = None
-    self.block_offset = None
-    self.block_size = None
-    self.filename = None
-    self.value = cache_address
-
-    if cache_address & 0x80000000:
-      self.is_initialized = u'True'
-    else:
-      self.is_initialized = u'False'
-
+    self._block_number = None
+    self._block_offset = None
+    self._block_size = None
+    self._decoded = False
+    self._filename = None
     self.file_type = (cache_address & 0x70000000) >> 28
-    if not cache_address == 0x00000000:
-      if self.file_type == self.FILE_TYPE_SEPARATE:
-        file_selector = cache_address & 0x0fffffff
-        self.filename = u'f_{0:06x}'.format(file_selector)
-
-      elif self.file_type in self._BLOCK_DATA_FILE_TYPES:
-        file_selector = (cache_address & 0x00ff0000) >> 16
-        self.filename = u'data_{0:d}'.format(file_selector)
+    self.value = cache_address
 
-        file_block_size = self._FILE_TYPE_BLOCK_SIZES[self.file_type]
-        self.block_number = cache_address & 0x0000ffff
-        self.block_size = (cache_address & 0x03000000) >> 24
-        self.block_size *= file_block_size
-        self.block_offset = 8192 + (self.block_number * file_block_size)
+  @property
+  def block_number(self):
+    """int: block data file number."""
+    if not self._decoded:
+      self._Decode()
+    return self._block_number
+
+  @property
+  def block_offset(self):
+    """int: offset within the block data file."""
+    if not self._decoded:
+      self._Decode()
+    return self._block_offset
+
+  @property
+  def block_size(self):
+    """int: block size."""
+    if not self._decoded:
+      self._Decode()
+    return self._block_size
+
+  @property
+  def filename(self):
+    """str: name of the block data file."""
+    if not self._decoded:
+      self._Decode()
+    return self._filename
+
+  @property
+  def is_initialized(self):
+    """str: "True" if the cache address is initialized, "False" otherwise."""
+    if self.value & 0x80000000:
+      return u'True'
+    return u'False'
+
+  def _DecodeBlockDataFile(self):
+    """Decodes the values of a block data file cache address."""
+    file_selector = (self.value & 0x00ff0000) >> 16
+    self._filename = u'data_{0:d}'.format(file_selector)
+
+    file_block_size = self._FILE_TYPE_BLOCK_SIZES[self.file_type]
+    self._block_number = self.value & 0x0000ffff
+    self._block_size = (self.value & 0x03000000) >> 24
+    self._block_size *= file_block_size
+    self._block_offset = 8192 + (self._block_number * file_block_size)
+
+  def _DecodeSeparateFile(self):
+    """Decodes the values of a separate file cache address."""
+    file_selector = self.value & 0x0fffffff
+    self._filename = u'f_{0:06x}'.format(file_selector)
+
+  def _DecodeUnsupportedFileType(self):
+    """Decodes the values of a cache address with an unsupported file type."""
+    return
+
+  # Decode methods per file type, the file type is stored in 3 bits.
+  _DECODE_METHODS = (
+      _DecodeSeparateFile,
+      _DecodeBlockDataFile,
+      _DecodeBlockDataFile,
+      _DecodeBlockDataFile,
+      _DecodeBlockDataFile,
+      _DecodeUnsupportedFileType,
+      _DecodeUnsupportedFileType,
+      _DecodeUnsupportedFileType)
+
+  def _Decode(self):
+    """Decodes the block data file values of the cache address."""
+    if not self.value == 0x00000000:
+      self._DECODE_METHODS[self.file_type](self)
+
+    self._decoded = True
 
   def GetDebugString(self):
     """Retrieves a debug string of the cache address object.
@@ -180,8 +239,9 @@ class CacheEntry(object):
         January 1, 1970, 00:00:00 UTC.
     hash (int): super fast hash of the key.
     key (byte): data of the key.
-    next (int): cache address of the next cache entry.
-    rankings_node (int): cache address of the rankings node.
+    next (CacheAddress): cache address of the next cache entry.
+    rankings_node (CacheAddress): cache address of the rankings node or None
+        if not read, which is only read when debug information is printed.
   """
 
   def __init__(self):
@@ -195,37 +255,31 @@ class CacheEntry(object):
 
 
 class IndexFile(object):
-  """Class that contains an index file."""
+  """Class that contains an index file.
+
+  Attributes:
+    cache_address_values (array.array): cache address values of the used
+        entries in the index table, in index order.
+    creation_time (int): creation time, in number of micro seconds since
+        January 1, 1601, 00:00:00 UTC.
+    index_table (dict[int, int]): cache address values of the used entries
+        in the index table, per index.
+    version (str): format version.
+  """
 
   SIGNATURE = 0xc103cac3
 
-  _FILE_HEADER = construct.Struct(
-      u'chrome_cache_index_file_header',
-      construct.ULInt32(u'signature'),
-      construct.ULInt16(u'minor_version'),
-      construct.ULInt16(u'major_version'),
-      construct.ULInt32(u'number_of_entries'),
-      construct.ULInt32(u'stored_data_size'),
-      construct.ULInt32(u'last_created_file_number'),
-      construct.ULInt32(u'unknown1'),
-      construct.ULInt32(u'unknown2'),
-      construct.ULInt32(u'table_size'),
-      construct.ULInt32(u'unknown3'),
-      construct.ULInt32(u'unknown4'),
-      construct.ULInt64(u'creation_time'),
-      construct.Padding(208))
-
-  _LRU_DATA = construct.Struct(
-      u'chrome_cache_index_file_lru_data',
-      construct.Padding(8),
-      construct.ULInt32(u'filled_flag'),
-      construct.Array(5, construct.ULInt32(u'sizes')),
-      construct.Array(5, construct.ULInt32(u'head_addresses')),
-      construct.Array(5, construct.ULInt32(u'tail_addresses')),
-      construct.ULInt32(u'transaction_address'),
-      construct.ULInt32(u'operation'),
-      construct.ULInt32(u'operation_list'),
-      construct.Padding(28))
+  # Signature, minor version, major version, number of entries, stored data
+  # size, last created file number, unknown1, unknown2, table size, unknown3,
+  # unknown4, creation time and 208 bytes of padding.
+  _FILE_HEADER = struct.Struct('<IHHIIIIIIIIQ208x')
+
+  FILE_HEADER_SIZE = _FILE_HEADER.size
+
+  # 8 bytes of padding, filled flag, 5 sizes, 5 head addresses, 5 tail
+  # addresses, transaction address, operation, operation list and 28 bytes
+  # of padding.
+  _LRU_DATA = struct.Struct('<8xI5I5I5IIII28x')
 
   def __init__(self, debug=False):
     """Initializes the index file object.
@@ -235,11 +289,47 @@ class IndexFile(object):
     """
     super(IndexFile, self).__init__()
     self._debug = debug
+    self._file_data = None
     self._file_object = None
     self._file_object_opened_in_object = False
+    self._index_table_indexes = array.array('I')
+    self._index_table_values = array.array('I')
+    self._table_size = None
     self.creation_time = None
     self.version = None
-    self.index_table = {}
+
+  @property
+  def cache_address_values(self):
+    """array.array: cache address values of the used index table entries."""
+    return self._index_table_values
+
+  @property
+  def index_table(self):
+    """dict[int, int]: cache address values of the used entries per index."""
+    return dict(zip(self._index_table_indexes, self._index_table_values))
+
+  def _ReadData(self, file_offset, data_size):
+    """Reads data.
+
+    The data is read from the memory mapped file if available.
+
+    Args:
+      file_offset (int): offset of the data relative to the start of the file.
+      data_size (int): size of the data or None to read the remainder of
+          the file.
+
+    Returns:
+      bytes: data.
+    """
+    if self._file_data is not None:
+      if data_size is None:
+        return self._file_data[file_offset:]
+      return self._file_data[file_offset:file_offset + data_size]
+
+    self._file_object.seek(file_offset, os.SEEK_SET)
+    if data_size is None:
+      return self._file_object.read()
+    return self._file_object.read(data_size)
 
   def _ReadFileHeader(self):
     """Reads the file header.
@@ -250,34 +340,43 @@ class IndexFile(object):
     if self._debug:
       print(u'Seeking file header offset: 0x{0:08x}'.format(0))
 
-    self._file_object.seek(0, os.SEEK_SET)
+    file_header_data = self._ReadData(0, self._FILE_HEADER.size)
+
+    self._ParseFileHeader(file_header_data)
+
+  def _ParseFileHeader(self, file_header_data):
+    """Parses the file header.
 
-    file_header_data = self._file_object.read(self._FILE_HEADER.sizeof())
+    Args:
+      file_header_data (bytes): file header data.
 
+    Raises:
+      IOError: if the file header cannot be parsed.
+    """
     if self._debug:
       print(u'Index file header data:')
       print(hexdump.Hexdump(file_header_data))
 
     try:
-      file_header = self._FILE_HEADER.parse(file_header_data)
-    except construct.FieldError as exception:
-      raise IOError(u'Unable to parse file header with error: {0:s}'.format(
+      (signature, minor_version, major_version, number_of_entries,
+       stored_data_size, last_created_file_number, unknown1, unknown2,
+       table_size, unknown3, unknown4, creation_time) = (
+           self._FILE_HEADER.unpack(file_header_data))
+    except struct.error as exception:
+      raise IOError(u'Unable to parse file header with error: {0!s}'.format(
           exception))
 
-    signature = file_header.get(u'signature')
-
     if signature != self.SIGNATURE:
       raise IOError(u'Unsupported index file signature')
 
-    self.version = u'{0:d}.{1:d}'.format(
-        file_header.get(u'major_version'),
-        file_header.get(u'minor_version'))
+    self.version = u'{0:d}.{1:d}'.format(major_version, minor_version)
 
     if self.version not in [u'2.0', u'2.1']:
       raise IOError(u'Unsupported index file version: {0:s}'.format(
           self.version))
 
-    self.creation_time = file_header.get(u'creation_time')
+    self._table_size = table_size
+    self.creation_time = creation_time
 
     if self._debug:
       print(u'Signature\t\t\t\t\t\t\t\t: 0x{0:08x}'.format(signature))
@@ -285,32 +384,31 @@ class IndexFile(object):
       print(u'Version\t\t\t\t\t\t\t\t\t: {0:s}'.format(self.version))
 
       print(u'Number of entries\t\t\t\t\t\t\t: {0:d}'.format(
-          file_header.get(u'number_of_entries')))
+          number_of_entries))
 
       print(u'Stored data size\t\t\t\t\t\t\t: {0:d}'.format(
-          file_header.get(u'stored_data_size')))
+          stored_data_size))
 
       print(u'Last created file number\t\t\t\t\t\t: f_{0:06x}'.format(
-          file_header.get(u'last_created_file_number')))
+          last_created_file_number))
 
       print(u'Unknown1\t\t\t\t\t\t\t\t: 0x{0:08x}'.format(
-          file_header.get(u'unknown1')))
+          unknown1))
 
       print(u'Unknown2\t\t\t\t\t\t\t\t: 0x{0:08x}'.format(
-          file_header.get(u'unknown2')))
+          unknown2))
 
       print(u'Table size\t\t\t\t\t\t\t\t: {0:d}'.format(
-          file_header.get(u'table_size')))
+          table_size))
 
       print(u'Unknown3\t\t\t\t\t\t\t\t: 0x{0:08x}'.format(
-          file_header.get(u'unknown3')))
+          unknown3))
 
       print(u'Unknown4\t\t\t\t\t\t\t\t: 0x{0:08x}'.format(
-          file_header.get(u'unknown4')))
+          unknown4))
 
-      date_string = (
-          datetime.datetime(1601, 1, 1) +
-          datetime.timedelta(microseconds=self.creation_time))
+      date_string = _EPOCH + datetime.timedelta(
+          microseconds=self.creation_time)
 
       print(u'Creation time\t\t\t\t\t\t\t\t: {0!s} (0x{1:08x})'.format(
           date_string, self.creation_time))
@@ -319,76 +417,91 @@ class IndexFile(object):
 
   def _ReadLruData(self):
     """Reads the LRU data."""
-    lru_data = self._file_object.read(self._LRU_DATA.sizeof())
+    lru_data = self._ReadData(self._FILE_HEADER.size, self._LRU_DATA.size)
 
     if self._debug:
       print(u'Index file LRU data:')
       print(hexdump.Hexdump(lru_data))
 
     try:
-      index_file_lru = self._LRU_DATA.parse(lru_data)
-    except construct.FieldError as exception:
-      raise IOError(u'Unable to parse LRU data with error: {0:s}'.format(
+      index_file_lru = self._LRU_DATA.unpack(lru_data)
+    except struct.error as exception:
+      raise IOError(u'Unable to parse LRU data with error: {0!s}'.format(
           exception))
 
     if self._debug:
+      filled_flag = index_file_lru[0]
+      sizes = index_file_lru[1:6]
+      head_addresses = index_file_lru[6:11]
+      tail_addresses = index_file_lru[11:16]
+      transaction_address, operation, operation_list = index_file_lru[16:]
+
       print(u'Filled flag\t\t\t\t\t\t\t\t: 0x{0:08x}'.format(
-          index_file_lru.get(u'filled_flag')))
+          filled_flag))
 
-      for value in index_file_lru.get(u'sizes'):
+      for value in sizes:
         print(u'Size\t\t\t\t\t\t\t\t\t: {0:d}'.format(value))
 
       cache_address_index = 0
-      for value in index_file_lru.get(u'head_addresses'):
+      for value in head_addresses:
         cache_address = CacheAddress(value)
         print(u'Head address: {0:d}\t\t\t\t\t\t\t\t: {1:s}'.format(
             cache_address_index, cache_address.GetDebugString()))
         cache_address_index += 1
 
       cache_address_index = 0
-      for value in index_file_lru.get(u'tail_addresses'):
+      for value in tail_addresses:
         cache_address = CacheAddress(value)
         print(u'Tail address: {0:d}\t\t\t\t\t\t\t\t: {1:s}'.format(
             cache_address_index, cache_address.GetDebugString()))
         cache_address_index += 1
 
-      cache_address = CacheAddress(index_file_lru.get(u'transaction_address'))
+      cache_address = CacheAddress(transaction_address)
       print(u'Transaction address\t\t\t\t\t\t\t: {0:s}'.format(
           cache_address.GetDebugString()))
 
-      print(u'Operation\t\t\t\t\t\t\t\t: 0x{0:08x}'.format(
-          index_file_lru.get(u'operation')))
+      print(u'Operation\t\t\t\t\t\t\t\t: 0x{0:08x}'.format(operation))
 
       print(u'Operation list\t\t\t\t\t\t\t\t: 0x{0:08x}'.format(
-          index_file_lru.get(u'operation_list')))
+          operation_list))
 
       print(u'')
 
   def _ReadIndexTable(self):
     """Reads the index table."""
-    cache_address_index = 0
-    cache_address_data = self._file_object.read(4)
-
-    while len(cache_address_data) == 4:
-      value = construct.ULInt32(u'cache_address').parse(cache_address_data)
+    file_offset = self._FILE_HEADER.size + self._LRU_DATA.size
 
-      if value:
-        cache_address = CacheAddress(value)
-
-        if self._debug:
-          print(u'Cache address: {0:d}\t\t\t\t\t\t\t: {1:s}'.format(
-              cache_address_index, cache_address.GetDebugString()))
+    if self._table_size:
+      index_table_data = self._ReadData(file_offset, self._table_size * 4)
+    else:
+      index_table_data = self._ReadData(file_offset, None)
 
-        self.index_table[cache_address_index] = cache_address
+    number_of_cache_addresses = len(index_table_data) // 4
+    values = struct.unpack_from(
+        '<{0:d}I'.format(number_of_cache_addresses), index_table_data)
 
-      cache_address_index += 1
-      cache_address_data = self._file_object.read(4)
+    # Only the non-zero (used) cache addresses are of interest, which are
+    # typically a small part of the index table. These are stored as arrays
+    # of indexes and values instead of objects.
+    self._index_table_indexes = array.array('I', itertools.compress(
+        range(number_of_cache_addresses), values))
+    self._index_table_values = array.array('I', filter(None, values))
 
     if self._debug:
+      for cache_address_index, value in zip(
+          self._index_table_indexes, self._index_table_values):
+        cache_address = CacheAddress(value)
+        print(u'Cache address: {0:d}\t\t\t\t\t\t\t: {1:s}'.format(
+            cache_address_index, cache_address.GetDebugString()))
+
       print(u'')
 
   def Close(self):
     """Closes the index file."""
+    if self._file_data is not None:
+      self._file_data.close()
+      self._file_data = None
+
     if self._file_object_opened_in_object:
       self._file_object.close()
     self._file_object = None
@@ -401,19 +514,35 @@ class IndexFile(object):
     """
     self._file_object = open(filename, 'rb')
     self._file_object_opened_in_object = True
+
+    try:
+      self._file_data = mmap.mmap(
+          self._file_object.fileno(), 0, access=mmap.ACCESS_READ)
+    except (EnvironmentError, ValueError):
+      # An empty file cannot be memory mapped, fall back to regular reads.
+      self._file_data = None
+
     self._ReadFileHeader()
     self._ReadLruData()
     self._ReadIndexTable()
 
-  def OpenFileObject(self, file_object):
+  def OpenFileObject(self, file_object, file_header_data=None):
     """Opens the index file-like object.
 
     Args:
       file_object (file): file-like object.
+      file_header_data (Optional[bytes]): data at the start of the file-like
+          object, if already read, which must contain at least the file
+          header.
     """
     self._file_object = file_object
     self._file_object_opened_in_object = False
-    self._ReadFileHeader()
+
+    if file_header_data:
+      self._ParseFileHeader(file_header_data[:self.FILE_HEADER_SIZE])
+    else:
+      self._ReadFileHeader()
+
     self._ReadLruData()
     self._ReadIndexTable()
 
@@ -424,39 +553,25 @@ class DataBlockFile(object):
   SIGNATURE = 0xc104cac3
 
   # TODO: update emtpy, hints, updating and user.
-  _FILE_HEADER = construct.Struct(
-      u'chrome_cache_data_file_header',
-      construct.ULInt32(u'signature'),
-      construct.ULInt16(u'minor_version'),
-      construct.ULInt16(u'major_version'),
-      construct.ULInt16(u'file_number'),
-      construct.ULInt16(u'next_file_number'),
-      construct.ULInt32(u'block_size'),
-      construct.ULInt32(u'number_of_entries'),
-      construct.ULInt32(u'maximum_number_of_entries'),
-      construct.Array(4, construct.ULInt32(u'emtpy')),
-      construct.Array(4, construct.ULInt32(u'hints')),
-      construct.ULInt32(u'updating'),
-      construct.Array(5, construct.ULInt32(u'user')),
-      construct.Array(2028, construct.ULInt32(u'allocation_bitmap')))
-
-  _CACHE_ENTRY = construct.Struct(
-      u'chrome_cache_entry',
-      construct.ULInt32(u'hash'),
-      construct.ULInt32(u'next_address'),
-      construct.ULInt32(u'rankings_node_address'),
-      construct.ULInt32(u'reuse_count'),
-      construct.ULInt32(u'refetch_count'),
-      construct.ULInt32(u'state'),
-      construct.ULInt64(u'creation_time'),
-      construct.ULInt32(u'key_size'),
-      construct.ULInt32(u'long_key_address'),
-      construct.Array(4, construct.ULInt32(u'data_stream_sizes')),
-      construct.Array(4, construct.ULInt32(u'data_stream_addresses')),
-      construct.ULInt32(u'flags'),
-      construct.Padding(16),
-      construct.ULInt32(u'self_hash'),
-      construct.Array(160, construct.UBInt8(u'key')))
+  # Signature, minor version, major version, file number, next file number,
+  # block size, number of entries, maximum number of entries, 4 empty, 4 hints,
+  # updating and 5 user values.
+  _FILE_HEADER = struct.Struct('<IHHHHIII4I4II5I')
+
+  # The allocation bitmap follows the fixed part of the file header, it is
+  # only parsed when debug information is printed.
+  _ALLOCATION_BITMAP = struct.Struct('<2028I')
+
+  FILE_HEADER_SIZE = _FILE_HEADER.size + _ALLOCATION_BITMAP.size
+
+  # Hash, next address, rankings node address, reuse count, refetch count,
+  # state, creation time, key size, long key address, 4 data stream sizes,
+  # 4 data stream addresses, flags, 16 bytes of padding, self hash and key.
+  _CACHE_ENTRY = struct.Struct('<6IQ2I4I4II16xI160s')
+
+  # Hash, next address, creation time and key of a cache entry, which are the
+  # only values needed when no debug information is printed.
+  _CACHE_ENTRY_MAIN_VALUES = struct.Struct('<II16xQ64x160s')
 
   def __init__(self, debug=False):
     """Initializes the data block file object.
@@ -465,7 +580,9 @@ class DataBlockFile(object):
       debug (Optional[bool]): True if debug information should be printed.
     """
     super(DataBlockFile, self).__init__()
+    self._cache_entries = {}
     self._debug = debug
+    self._file_data = None
     self._file_object = None
     self._file_object_opened_in_object = False
     self.creation_time = None
@@ -473,6 +590,29 @@ class DataBlockFile(object):
     self.number_of_entries = None
     self.version = None
 
+  def _ReadData(self, file_offset, data_size):
+    """Reads data.
+
+    The data is read from the memory mapped file if available.
+
+    Args:
+      file_offset (int): offset of the data relative to the start of the file.
+      data_size (int): size of the data or None to read the remainder of
+          the file.
+
+    Returns:
+      bytes: data.
+    """
+    if self._file_data is not None:
+      if data_size is None:
+        return self._file_data[file_offset:]
+      return self._file_data[file_offset:file_offset + data_size]
+
+    self._file_object.seek(file_offset, os.SEEK_SET)
+    if data_size is None:
+      return self._file_object.read()
+    return self._file_object.read(data_size)
+
   def _ReadFileHeader(self):
     """Reads the file header.
 
@@ -482,38 +622,48 @@ class DataBlockFile(object):
     if self._debug:
       print(u'Seeking file header offset: 0x{0:08x}'.format(0))
 
-    self._file_object.seek(0, os.SEEK_SET)
+    file_header_data = self._ReadData(0, self.FILE_HEADER_SIZE)
+
+    self._ParseFileHeader(file_header_data)
 
-    file_header_data = self._file_object.read(self._FILE_HEADER.sizeof())
+  def _ParseFileHeader(self, file_header_data):
+    """Parses the file header.
+
+    Args:
+      file_header_data (bytes): file header data.
 
+    Raises:
+      IOError: if the file header cannot be parsed.
+    """
     if self._debug:
       print(u'Data block file header data:')
       print(hexdump.Hexdump(file_header_data))
 
+    if len(file_header_data) != self.FILE_HEADER_SIZE:
+      raise IOError(u'Unsupported data block file header size: {0:d}'.format(
+          len(file_header_data)))
+
     try:
-      file_header = self._FILE_HEADER.parse(file_header_data)
-    except construct.FieldError as exception:
-      raise IOError(u'Unable to parse file header with error: {0:s}'.format(
+      file_header = self._FILE_HEADER.unpack_from(file_header_data)
+    except struct.error as exception:
+      raise IOError(u'Unable to parse file header with error: {0!s}'.format(
           exception))
 
-    signature = file_header.get(u'signature')
+    (signature, minor_version, major_version, file_number, next_file_number,
+     block_size, number_of_entries, maximum_number_of_entries) = (
+         file_header[:8])
 
     if signature != self.SIGNATURE:
       raise IOError(u'Unsupported data block file signature')
 
-    self.version = u'{0:d}.{1:d}'.format(
-        file_header.get(u'major_version'),
-        file_header.get(u'minor_version'))
+    self.version = u'{0:d}.{1:d}'.format(major_version, minor_version)
 
     if self.version not in [u'2.0', u'2.1']:
       raise IOError(u'Unsupported data block file version: {0:s}'.format(
           self.version))
 
-    self.version = u'{0:d}.{1:d}'.format(
-        file_header.get(u'major_version'), file_header.get(u'minor_version'))
-
-    self.block_size = file_header.get(u'block_size')
-    self.number_of_entries = file_header.get(u'number_of_entries')
+    self.block_size = block_size
+    self.number_of_entries = number_of_entries
 
     if self._debug:
       print(u'Signature\t\t\t\t\t\t\t\t: 0x{0:08x}'.format(signature))
@@ -521,10 +671,10 @@ class DataBlockFile(object):
       print(u'Version\t\t\t\t\t\t\t\t\t: {0:s}'.format(self.version))
 
       print(u'File number\t\t\t\t\t\t\t\t: {0:d}'.format(
-          file_header.get(u'file_number')))
+          file_number))
 
       print(u'Next file number\t\t\t\t\t\t\t: {0:d}'.format(
-          file_header.get(u'next_file_number')))
+          next_file_number))
 
       print(u'Block size\t\t\t\t\t\t\t\t: {0:d}'.format(self.block_size))
 
@@ -532,75 +682,90 @@ class DataBlockFile(object):
           self.number_of_entries))
 
       print(u'Maximum number of entries\t\t\t\t\t\t: {0:d}'.format(
-          file_header.get(u'maximum_number_of_entries')))
+          maximum_number_of_entries))
 
       # TODO: print emtpy, hints, updating and user.
 
-      block_number = 0
-      block_range_start = 0
-      block_range_end = 0
-      in_block_range = False
-      for value_32bit in file_header.get(u'allocation_bitmap'):
-        for unused_bit in range(0, 32):
-          if value_32bit & 0x00000001:
-            if not in_block_range:
-              block_range_start = block_number
-              block_range_end = block_number
-              in_block_range = True
+      allocation_bitmap = self._ALLOCATION_BITMAP.unpack_from(
+          file_header_data, self._FILE_HEADER.size)
 
-            block_range_end += 1
+      # Represent the allocation bitmap as a string of bits, with the least
+      # significant bit of every 32-bit value first, so that the ranges of
+      # allocated blocks can be determined without testing individual bits.
+      allocation_bits = u''.join([
+          u'{0:032b}'.format(value_32bit)[::-1]
+          for value_32bit in allocation_bitmap])
 
-          elif in_block_range:
-            in_block_range = False
-
-            if self._debug:
-              print(u'Block range\t: {0:d} - {1:d} ({2:d})'.format(
-                  block_range_start, block_range_end,
-                  block_range_end - block_range_start))
-
-          value_32bit >>= 1
-          block_number += 1
+      for block_range in re.finditer(u'1+', allocation_bits):
+        block_range_start, block_range_end = block_range.span()
+        print(u'Block range\t: {0:d} - {1:d} ({2:d})'.format(
+            block_range_start, block_range_end,
+            block_range_end - block_range_start))
 
       print(u'')
 
   def ReadCacheEntry(self, block_offset):
     """Reads a cache entry.
 
+    Cache entries are cached by block offset, since the same cache entry can
+    be reached by multiple cache address chains.
+
     Args:
       block_offset (int): offset of the block that contains the cache entry.
-    ""
+
+    Returns:
+      CacheEntry: cache entry.
+
+    Raises:
+      IOError: if the cache entry cannot be read.
+    """
+    cache_entry = self._cache_entries.get(block_offset, None)
+    if cache_entry:
+      return cache_entry
+
     if self._debug:
       print(u'Seeking cache entry offset: 0x{0:08x}'.format(block_offset))
 
-    self._file_object.seek(block_offset, os.SEEK_SET)
-
-    cache_entry_data = self._file_object.read(self._CACHE_ENTRY.sizeof())
+    cache_entry_data = self._ReadData(block_offset, self._CACHE_ENTRY.size)
 
     if self._debug:
       print(u'Data block file cache entry data:')
       print(hexdump.Hexdump(cache_entry_data))
 
+      structure = self._CACHE_ENTRY
+    else:
+      structure = self._CACHE_ENTRY_MAIN_VALUES
+
     try:
-      cache_entry_struct = self._CACHE_ENTRY.parse(cache_entry_data)
-    except construct.FieldError as exception:
-      raise IOError(u'Unable to parse cache entry with error: {0:s}'.format(
+      cache_entry_struct = structure.unpack(cache_entry_data)
+    except struct.error as exception:
+      raise IOError(u'Unable to parse cache entry with error: {0!s}'.format(
           exception))
 
     cache_entry = CacheEntry()
 
-    cache_entry.hash = cache_entry_struct.get(u'hash')
+    if self._debug:
+      (hash_value, next_address, rankings_node_address, reuse_count,
+       refetch_count, state, creation_time, _, _) = cache_entry_struct[:9]
+
+      cache_entry.rankings_node = CacheAddress(rankings_node_address)
 
-    cache_entry.next = CacheAddress(cache_entry_struct.get(u'next_address'))
-    cache_entry.rankings_node = CacheAddress(cache_entry_struct.get(
-        u'rankings_node_address'))
+    else:
+      hash_value, next_address, creation_time = cache_entry_struct[:3]
+
+    key_data = cache_entry_struct[-1]
 
-    cache_entry.creation_time = cache_entry_struct.get(u'creation_time')
+    cache_entry.hash = hash_value
+    cache_entry.next = CacheAddress(next_address)
+    cache_entry.creation_time = creation_time
 
-    byte_array = cache_entry_struct.get(u'key')
-    byte_string = b''.join(map(chr, byte_array))
-    cache_entry.key, _, _ = byte_string.partition(b'\x00')
+    cache_entry.key, _, _ = key_data.partition(b'\x00')
 
     if self._debug:
+      data_stream_sizes = cache_entry_struct[9:13]
+      data_stream_addresses = cache_entry_struct[13:17]
+      flags, self_hash = cache_entry_struct[17:19]
+
       print(u'Hash\t\t\t\t\t\t\t\t\t: 0x{0:08x}'.format(cache_entry.hash))
 
       print(u'Next address\t\t\t\t\t\t\t\t: {0:s}'.format(
@@ -610,43 +775,40 @@ class DataBlockFile(object):
           cache_entry.rankings_node.GetDebugString()))
 
       print(u'Reuse count\t\t\t\t\t\t\t\t: {0:d}'.format(
-          cache_entry_struct.get(u'reuse_count')))
+          reuse_count))
 
       print(u'Refetch count\t\t\t\t\t\t\t\t: {0:d}'.format(
-          cache_entry_struct.get(u'refetch_count')))
+          refetch_count))
 
-      print(u'State\t\t\t\t\t\t\t\t\t: 0x{0:08x}'.format(
-          cache_entry_struct.get(u'state')))
+      print(u'State\t\t\t\t\t\t\t\t\t: 0x{0:08x}'.format(state))
 
-      date_string = (datetime.datetime(1601, 1, 1) +
-                     datetime.timedelta(microseconds=cache_entry.creation_time))
+      date_string = _EPOCH + datetime.timedelta(
+          microseconds=cache_entry.creation_time)
 
       print(u'Creation time\t\t\t\t\t\t\t\t: {0!s} (0x{1:08x})'.format(
           date_string, cache_entry.creation_time))
 
-      for value in cache_entry_struct.get(u'data_stream_sizes'):
+      for value in data_stream_sizes:
         print(u'Data stream size\t\t\t\t\t\t\t: {0:d}'.format(value))
 
       cache_address_index = 0
-      for value in cache_entry_struct.get(u'data_stream_addresses'):
+      for value in data_stream_addresses:
         cache_address = CacheAddress(value)
         print(u'Data stream address: {0:d}\t\t\t\t\t\t\t: {1:s}'.format(
             cache_address_index, cache_address.GetDebugString()))
         cache_address_index += 1
 
-      print(u'Flags\t\t\t\t\t\t\t\t\t: 0x{0:08x}'.format(
-          cache_entry_struct.get(u'flags')))
+      print(u'Flags\t\t\t\t\t\t\t\t\t: 0x{0:08x}'.format(flags))
 
-      print(u'Self hash\t\t\t\t\t\t\t\t: 0x{0:08x}'.format(
-          cache_entry_struct.get(u'self_hash')))
+      print(u'Self hash\t\t\t\t\t\t\t\t: 0x{0:08x}'.format(self_hash))
 
       try:
         cache_entry_key = cache_entry.key.decode(u'ascii')
       except UnicodeDecodeError:
         logging.warning((
-            u'Unable to decode cache entry key at cache address: '
-            u'0x{0:08x}. Characters that cannot be decoded will be '
-            u'replaced with "?" or "\\ufffd".').format(cache_address.value))
+            u'Unable to decode cache entry key at offset: 0x{0:08x}. '
+            u'Characters that cannot be decoded will be replaced with "?" '
+            u'or "\\ufffd".').format(block_offset))
         cache_entry_key = cache_entry.key.decode(u'ascii', errors=u'replace')
 
       print(u'Key\t\t\t\t\t\t\t\t\t: {0:s}'.format(cache_entry_key))
@@ -655,10 +817,18 @@ class DataBlockFile(object):
 
       print(u'')
 
+    self._cache_entries[block_offset] = cache_entry
+
     return cache_entry
 
   def Close(self):
     """Closes the data block file."""
+    self._cache_entries = {}
+
+    if self._file_data is not None:
+      self._file_data.close()
+      self._file_data = None
+
     if self._file_object_opened_in_object:
       self._file_object.close()
     self._file_object = None
@@ -671,17 +841,151 @@ class DataBlockFile(object):
     """
     self._file_object = open(filename, 'rb')
     self._file_object_opened_in_object = True
+
+    try:
+      self._file_data = mmap.mmap(
+          self._file_object.fileno(), 0, access=mmap.ACCESS_READ)
+    except (EnvironmentError, ValueError):
+      # An empty file cannot be memory mapped, fall back to regular reads.
+      self._file_data = None
+
     self._ReadFileHeader()
 
-  def OpenFileObject(self, file_object):
+  def OpenFileObject(self, file_object, file_header_data=None):
     """Opens the data block file.
 
     Args:
       file_object (file): file-like object.
+      file_header_data (Optional[bytes]): data at the start of the file-like
+          object, if already read, which must contain at least the file
+          header.
     """
     self._file_object = file_object
     self._file_object_opened_in_object = False
-    self._ReadFileHeader()
+
+    if file_header_data:
+      self._ParseFileHeader(file_header_data[:self.FILE_HEADER_SIZE])
+    else:
+      self._ReadFileHeader()
+
+
+class DataBlockFiles(object):
+  """Class that contains the data block files of a Chrome Cache directory.
+
+  A data block file is opened when it is first requested and remains open
+  until the data block files are closed.
+
+  Attributes:
+    missing_filenames (set[str]): names of the requested data block files
+        that do not exist.
+  """
+
+  def __init__(self, path, debug=False):
+    """Initializes the data block files object.
+
+    Args:
+      path (str): path of the Chrome Cache directory.
+      debug (Optional[bool]): True if debug information should be printed.
+    """
+    super(DataBlockFiles, self).__init__()
+    self._data_block_files = {}
+    self._debug = debug
+    self._path = path
+    self.missing_filenames = set()
+
+  def Close(self):
+    """Closes the data block files."""
+    for data_block_file in iter(self._data_block_files.values()):
+      if data_block_file:
+        data_block_file.Close()
+
+    self._data_block_files = {}
+
+  def GetDataBlockFile(self, filename):
+    """Retrieves a data block file.
+
+    Args:
+      filename (str): name of the data block file.
+
+    Returns:
+      DataBlockFile: data block file or None if not available.
+    """
+    if not filename:
+      return None
+
+    if filename in self._data_block_files:
+      return self._data_block_files[filename]
+
+    data_block_file_path = os.path.join(self._path, filename)
+
+    if not os.path.exists(data_block_file_path):
+      logging.error(u'Missing data block file: {0:s}'.format(
+          data_block_file_path))
+      self.missing_filenames.add(filename)
+      data_block_file = None
+
+    else:
+      data_block_file = DataBlockFile(debug=self._debug)
+      data_block_file.Open(data_block_file_path)
+
+    self._data_block_files[filename] = data_block_file
+    return data_block_file
+
+
+def ReadCacheAddressChain(cache_address, data_block_files):
+  """Reads the cache entries of a cache address chain.
+
+  Args:
+    cache_address (CacheAddress): cache address of the first cache entry in
+        the chain.
+    data_block_files (DataBlockFiles): data block files.
+
+  Returns:
+    list[tuple[datetime.datetime, str]]: creation date and time and key of
+        the cache entries in the chain.
+  """
+  cache_entries = []
+  cache_address_chain_length = 0
+  while cache_address.value != 0x00000000:
+    if cache_address_chain_length >= 64:
+      logging.error(u'Maximum allowed cache address chain length reached.')
+      break
+
+    if (cache_address.file_type == CacheAddress.FILE_TYPE_SEPARATE or
+        cache_address.block_offset is None):
+      logging.warning((
+          u'Cache address: 0x{0:08x} does not refer to a block data '
+          u'file.').format(cache_address.value))
+      break
+
+    data_file = data_block_files.GetDataBlockFile(cache_address.filename)
+    if not data_file:
+      logging.warning(u'Cache address: 0x{0:08x} missing filename.'.format(
+          cache_address.value))
+      break
+
+    # print(u'Cache address\t: {0:s}'.format(
+    #     cache_address.GetDebugString()))
+    cache_entry = data_file.ReadCacheEntry(cache_address.block_offset)
+
+    try:
+      cache_entry_key = cache_entry.key.decode(u'ascii')
+    except UnicodeDecodeError:
+      logging.warning((
+          u'Unable to decode cache entry key at cache address: '
+          u'0x{0:08x}. Characters that cannot be decoded will be '
+          u'replaced with "?" or "\\ufffd".').format(cache_address.value))
+      cache_entry_key = cache_entry.key.decode(u'ascii', errors=u'replace')
+
+    date_string = _EPOCH + datetime.timedelta(
+        microseconds=cache_entry.creation_time)
+
+    cache_entries.append((date_string, cache_entry_key))
+
+    cache_address = cache_entry.next
+    cache_address_chain_length += 1
+
+  return cache_entries
 
 
 def Main():
@@ -722,73 +1026,18 @@ def Main():
     index_file = IndexFile(debug=options.debug)
     index_file.Open(index_file_path)
 
-    data_block_files = {}
-    have_all_data_block_files = True
-    for cache_address in iter(index_file.index_table.values()):
-      if cache_address.filename not in data_block_files:
-        data_block_file_path = os.path.join(
-            options.source, cache_address.filename)
-
-        if not os.path.exists(data_block_file_path):
-          logging.error(u'Missing data block file: {0:s}'.format(
-              data_block_file_path))
-          have_all_data_block_files = False
-
-        else:
-          data_block_file = DataBlockFile(debug=options.debug)
-          data_block_file.Open(data_block_file_path)
-
-          data_block_files[cache_address.filename] = data_block_file
-
-    if have_all_data_block_files:
-      # TODO: read the cache entries from the data block files
-      for cache_address in iter(index_file.index_table.values()):
-        cache_address_chain_length = 0
-        while cache_address.value != 0x00000000:
-          if cache_address_chain_length >= 64:
-            logging.error(
-                u'Maximum allowed cache address chain length reached.')
-            break
-
-          data_file = data_block_files.get(cache_address.filename, None)
-          if not data_file:
-            logging.warning(
-                u'Cache address: 0x{0:08x} missing filename.'.format(
-                    cache_address.value))
-            break
-
-          # print(u'Cache address\t: {0:s}'.format(
-          #     cache_address.GetDebugString()))
-          cache_entry = data_file.ReadCacheEntry(cache_address.block_offset)
-
-          try:
-            cache_entry_key = cache_entry.key.decode(u'ascii')
-          except UnicodeDecodeError:
-            logging.warning((
-                u'Unable to decode cache entry key at cache address: '
-                u'0x{0:08x}. Characters that cannot be decoded will be '
-                u'replaced with "?" or "\\ufffd".').format(cache_address.value))
-            cache_entry_key = cache_entry.key.decode(
-                u'ascii', errors=u'replace')
-
-          # TODO: print(u'Url\t\t: {0:s}'.format(cache_entry_key))
-          _ = cache_entry_key
-
-          date_string = (datetime.datetime(1601, 1, 1) + datetime.timedelta(
-              microseconds=cache_entry.creation_time))
-
-          # print(u'Creation time\t: {0!s}'.format(date_string))
-
-          # print(u'')
-
-          print(u'{0!s}\t{1:s}'.format(date_string, cache_entry.key))
-
-          cache_address = cache_entry.next
-          cache_address_chain_length += 1
-
-    for data_block_file in iter(data_block_files.values()):
-      data_block_file.Close()
+    data_block_files = DataBlockFiles(options.source, debug=options.debug)
+
+    # TODO: read the cache entries from the data block files
+    for value in index_file.cache_address_values:
+      cache_address = CacheAddress(value)
+      for date_string, cache_entry_key in ReadCacheAddressChain(
+          cache_address, data_block_files):
+        print(date_string, cache_entry_key, sep=u'\t')
 
+    have_all_data_block_files = not data_block_files.missing_filenames
+
+    data_block_files.Close()
     index_file.Close()
 
     if not have_all_data_block_files:
@@ -797,18 +1046,25 @@ def Main():
   else:
     file_object = open(options.source, 'rb')
 
-    signature_data = file_object.read(4)
-    signature = construct.ULInt32(u'signature').parse(signature_data)
+    # Read the data of the largest file header once, to determine the file
+    # type from the signature and to parse the file header.
+    file_header_data = file_object.read(max(
+        IndexFile.FILE_HEADER_SIZE, DataBlockFile.FILE_HEADER_SIZE))
+
+    signature = None
+    if len(file_header_data) >= 4:
+      signature, = struct.unpack_from('<I', file_header_data)
 
     if signature == IndexFile.SIGNATURE:
       index_file = IndexFile(debug=options.debug)
-      index_file.Read(file_object)
-      index_file.OpenFileObject(file_object)
+      index_file.OpenFileObject(
+          file_object, file_header_data=file_header_data)
       index_file.Close()
 
     elif signature == DataBlockFile.SIGNATURE:
       data_block_file = DataBlockFile(debug=options.debug)
-      data_block_file.OpenFileObject(file_object)
+      data_block_file.OpenFileObject(
+          file_object, file_header_data=file_header_data)
       data_block_file.Close()
 
     file_object.close()
@@ -1,8 +1,10 @@
 # -*- coding: utf-8 -*-
 """Function to provide hexadecimal represenation of data."""
 
-_HEXDUMP_CHARACTER_MAP = [
-    '.' if byte < 0x20 or byte > 0x7e else chr(byte) for byte in range(256)]
+_HEXDUMP_BYTE_STRINGS = [u'{0:02x}'.format(byte) for byte in range(256)]
+
+_HEXDUMP_CHARACTER_MAP = bytes(bytearray([
+    0x2e if byte < 0x20 or byte > 0x7e else byte for byte in range(256)]))
 
 
 def Hexdump(data):
@@ -19,16 +21,17 @@ def Hexdump(data):
 
   lines = []
   data_size = len(data)
-  for block_index in xrange(0, data_size, 16):
-    data_string = data[block_index:block_index + 16]
+  for block_index in range(0, data_size, 16):
+    data_string = bytes(data[block_index:block_index + 16])
+    byte_values = bytearray(data_string)
 
     hexadecimal_string1 = ' '.join([
-        u'{0:02x}'.format(ord(byte_value)) for byte_value in data_string[0:8]])
+        _HEXDUMP_BYTE_STRINGS[byte_value] for byte_value in byte_values[0:8]])
     hexadecimal_string2 = ' '.join([
-        u'{0:02x}'.format(ord(byte_value)) for byte_value in data_string[8:16]])
+        _HEXDUMP_BYTE_STRINGS[byte_value] for byte_value in byte_values[8:16]])
 
-    printable_string = u''.join([
-        _HEXDUMP_CHARACTER_MAP[ord(byte_value)] for byte_value in data_string])
+    printable_string = data_string.translate(
+        _HEXDUMP_CHARACTER_MAP).decode(u'ascii')
 
     remaining_size = 16 - len(data_string)
     if remaining_size == 0: